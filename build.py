@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 import json
+import os
 import sys
 import subprocess
+import functools
+import hashlib
 import platform
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Shared by parallel steps: once a step fails, no new commands are started
+running_processes = set()
+processes_lock = threading.Lock()
+build_cancelled = threading.Event()
+
+# Only files tracked in the repo: Cargo.lock is gitignored, so it is missing
+# on a fresh checkout and would change the key once cargo fetch creates it
+DEPS_LOCKFILES = [
+    Path("pnpm-lock.yaml"),
+    Path("src-python/requirements.txt")
+]
+DEPS_STAMP = Path(".build-cache/deps.stamp")
+
 def load_config():
     config_path = Path("app.config.json")
     if not config_path.exists():
@@ -16,43 +35,91 @@ def load_config():
 
 def run_command(command, description, cwd=None):
     print(f"🔧 {description}...")
-    try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            check=True,
+    # Resolve via PATH ourselves so Windows .cmd shims (pnpm) work without a shell
+    executable = shutil.which(command[0])
+    if executable is None:
+        print(f"❌ {description} failed!")
+        print(f"Error: {command[0]} not found on PATH")
+        return False
+    with processes_lock:
+        if build_cancelled.is_set():
+            print(f"⏹️  {description} cancelled")
+            return False
+        # Stream output line by line (tagged, since steps may run in parallel)
+        # instead of buffering whole build logs in memory
+        process = subprocess.Popen(
+            [executable, *command[1:]],
             cwd=cwd,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # Node/Cargo tooling writes UTF-8 regardless of the locale (cp1252 on Windows)
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1
         )
-        print(f"✅ {description} completed")
-        return True
-    except subprocess.CalledProcessError as e:
+        running_processes.add(process)
+    try:
+        for line in process.stdout:
+            print(f"   [{description}] {line}", end="", flush=True)
+        returncode = process.wait()
+    finally:
+        with processes_lock:
+            running_processes.discard(process)
+    if returncode != 0 and build_cancelled.is_set():
+        print(f"⏹️  {description} cancelled")
+        return False
+    if returncode != 0:
         print(f"❌ {description} failed!")
-        print(f"Error: {e.stderr}")
+        print(f"Error: exited with status {returncode}")
         return False
+    print(f"✅ {description} completed")
+    return True
 
 def check_dependencies():
     print("🔍 Checking dependencies...")
-    required_tools = {
-        "pnpm": "pnpm --version",
-        "python3": "python3 --version",
-        "pip3": "pip3 --version"
-    }
+    required_tools = ["pnpm", "python3", "pip3"]
     missing_tools = []
-    for tool, check_cmd in required_tools.items():
-        try:
-            subprocess.run(check_cmd, shell=True, check=True, capture_output=True)
-            print(f"✅ {tool} is available")
-        except subprocess.CalledProcessError:
+    for tool in required_tools:
+        if shutil.which(tool) is None:
             print(f"❌ {tool} is not available")
             missing_tools.append(tool)
+        else:
+            print(f"✅ {tool} is available")
     if missing_tools:
         print(f"\n❌ Missing required tools: {', '.join(missing_tools)}")
         print("Please install the missing tools and try again.")
         sys.exit(1)
     print("✅ All dependencies are available")
 
+def deps_hash():
+    digest = hashlib.sha256()
+    for lockfile in DEPS_LOCKFILES:
+        if lockfile.exists():
+            digest.update(str(lockfile).encode())
+            digest.update(lockfile.read_bytes())
+    return digest.hexdigest()
+
+def install_dependencies():
+    # Record the interpreter too, so switching virtualenvs triggers a reinstall
+    stamp = f"{deps_hash()} {sys.executable}"
+    installed = Path("node_modules").is_dir()
+    if installed and DEPS_STAMP.exists() and DEPS_STAMP.read_text().strip() == stamp:
+        print("⏭️  Dependencies unchanged since last install, skipping")
+        return True
+    install_steps = [
+        (["pnpm", "install"], "Installing Node.js dependencies", None),
+        ([sys.executable, "-m", "pip", "install", "-r", "src-python/requirements.txt"], "Installing Python dependencies", None)
+    ]
+    if shutil.which("cargo"):
+        install_steps.append((["cargo", "fetch"], "Fetching Rust dependencies", "src-tauri"))
+    for command, description, cwd in install_steps:
+        if not run_command(command, description, cwd=cwd):
+            return False
+    DEPS_STAMP.parent.mkdir(exist_ok=True)
+    DEPS_STAMP.write_text(stamp + "\n")
+    return True
+
+@functools.lru_cache(maxsize=1)
 def detect_platform():
     system = platform.system().lower()
     if system == "darwin":
@@ -74,24 +141,47 @@ def build_icons(config):
         print(f"⚠️  Icon source not found: {icon_source}")
         print("Skipping icon generation")
         return True
-    return run_command("pnpm run build:icons", "Building app icons")
+    return run_command(["pnpm", "run", "build:icons"], "Building app icons")
 
 def build_sidecar():
     platform_name = detect_platform()
-    try:
-        subprocess.run("pyinstaller --version", shell=True, check=True, capture_output=True)
-    except subprocess.CalledProcessError:
+    if shutil.which("pyinstaller") is None:
         print("❌ PyInstaller not found!")
         print("Installing PyInstaller...")
-        if not run_command("pip3 install pyinstaller", "Installing PyInstaller"):
+        if not run_command([sys.executable, "-m", "pip", "install", "pyinstaller"], "Installing PyInstaller"):
             return False
-    return run_command(f"pnpm run build:sidecar-{platform_name}", f"Building Python sidecar for {platform_name}")
+    return run_command(["pnpm", "run", f"build:sidecar-{platform_name}"], f"Building Python sidecar for {platform_name}")
 
 def build_frontend():
-    return run_command("pnpm run build", "Building SvelteKit frontend")
+    return run_command(["pnpm", "run", "build"], "Building SvelteKit frontend")
 
 def build_tauri_app():
-    return run_command("pnpm tauri build", "Building Tauri application")
+    return run_command(["pnpm", "tauri", "build"], "Building Tauri application")
+
+def run_parallel_steps(steps):
+    max_workers = min(len(steps), os.cpu_count() or 1)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(step_func): step_name for step_name, step_func in steps}
+    failed_step = None
+    for future in as_completed(futures):
+        try:
+            succeeded = future.result()
+        except Exception as e:
+            print(f"❌ {futures[future]} raised: {e}")
+            succeeded = False
+        if not succeeded:
+            failed_step = futures[future]
+            break
+    if failed_step:
+        # Drop steps that haven't started and stop the ones still running
+        for future in futures:
+            future.cancel()
+        with processes_lock:
+            build_cancelled.set()
+            for process in running_processes:
+                process.terminate()
+    executor.shutdown(wait=True)
+    return failed_step
 
 def show_build_results():
     print("\n🎉 Build completed successfully!")
@@ -99,16 +189,18 @@ def show_build_results():
     bundle_dir = Path("src-tauri/target/release/bundle")
     if bundle_dir.exists():
         print(f"   📁 Bundle directory: {bundle_dir}")
-        for item in bundle_dir.iterdir():
-            if item.is_dir():
-                print(f"   📦 {item.name}/")
-                for bundle_file in item.iterdir():
+        with os.scandir(bundle_dir) as entries:
+            bundle_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        for item in bundle_dirs:
+            print(f"   📦 {item.name}/")
+            with os.scandir(item.path) as bundle_files:
+                for bundle_file in bundle_files:
                     if bundle_file.is_file():
                         size = bundle_file.stat().st_size / (1024 * 1024)
                         print(f"      📄 {bundle_file.name} ({size:.1f} MB)")
-    system = platform.system().lower()
+    system = detect_platform()
     print(f"\n🚀 Distribution files for {system}:")
-    if system == "darwin":
+    if system == "macos":
         print("   • .app file for direct execution")
         print("   • .dmg file for distribution")
     elif system == "linux":
@@ -123,10 +215,15 @@ def show_build_results():
     print(f"   • Consider code signing for production distribution")
 
 def main():
+    args = sys.argv[1:]
+    if "--deps-hash" in args:
+        # Cache key for CI (e.g. actions/cache)
+        print(deps_hash())
+        return
     print("🏗️  Complete Production Build")
     print("=" * 50)
-    args = sys.argv[1:]
     only_sidecar = "--sidecar" in args
+    use_cache = "--use-cache" in args
 
     config = load_config()
     print(f"📋 Building: {config['app']['productName']} v{config['app']['version']}")
@@ -134,6 +231,12 @@ def main():
     check_dependencies()
     print("")
 
+    if use_cache:
+        if not install_dependencies():
+            print("\n❌ Dependency installation failed")
+            sys.exit(1)
+        print("")
+
     if only_sidecar:
         print("🚀 Building only Python Sidecar...")
         if not build_sidecar():
@@ -142,19 +245,24 @@ def main():
         print("\n✅ Sidecar build complete")
         return
 
-    build_steps = [
+    # Icons, sidecar and frontend are independent; only the Tauri bundle needs all three
+    parallel_steps = [
         ("Icons", lambda: build_icons(config)),
         ("Python Sidecar", build_sidecar),
-        ("SvelteKit Frontend", build_frontend),
-        ("Tauri Application", build_tauri_app)
+        ("SvelteKit Frontend", build_frontend)
     ]
     print("🚀 Starting full build process...\n")
-    for step_name, step_func in build_steps:
-        print(f"📋 Step: {step_name}")
-        if not step_func():
-            print(f"\n❌ Build failed at step: {step_name}")
-            sys.exit(1)
-        print("")
+    print(f"📋 Steps (parallel): {', '.join(name for name, _ in parallel_steps)}")
+    failed_step = run_parallel_steps(parallel_steps)
+    if failed_step:
+        print(f"\n❌ Build failed at step: {failed_step}")
+        sys.exit(1)
+    print("")
+    print("📋 Step: Tauri Application")
+    if not build_tauri_app():
+        print("\n❌ Build failed at step: Tauri Application")
+        sys.exit(1)
+    print("")
     show_build_results()
 
 if __name__ == "__main__":
@@ -4,11 +4,21 @@ Project Configuration Script
 Reads app.config.json and configures all project files accordingly
 """
 
-import json
+import hashlib
 import os
 import sys
 from pathlib import Path
 
+import orjson
+import tomlkit
+
+STAMP_PATH = Path(".configure.stamp")
+TARGET_FILES = [
+    Path("package.json"),
+    Path("src-tauri/tauri.conf.json"),
+    Path("src-tauri/Cargo.toml"),
+]
+
 def load_config():
     """Load configuration from app.config.json"""
     config_path = Path("app.config.json")
@@ -17,16 +27,41 @@ def load_config():
         print("Please create app.config.json with your app configuration.")
         sys.exit(1)
     
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    return orjson.loads(config_path.read_bytes())
+
+def config_hash(config):
+    """Stable hash of the loaded configuration"""
+    return hashlib.sha256(orjson.dumps(config, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def is_up_to_date(digest):
+    """Check whether the last run used the same configuration"""
+    if not STAMP_PATH.exists() or not all(path.exists() for path in TARGET_FILES):
+        return False
+    return STAMP_PATH.read_text().strip() == digest
+
+def write_if_changed(path, content):
+    """Write bytes only when they differ, preserving mtimes for build caches"""
+    if path.exists() and path.read_bytes() == content:
+        return False
+    # Write to a sibling temp file and swap it in, so an interrupted run can't leave a torn file
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    return True
+
+def report(changed, label):
+    """Print whether a target file was rewritten"""
+    if changed:
+        print(f"✅ {label} updated")
+    else:
+        print(f"⏭️  {label} unchanged")
 
 def update_package_json(config):
     """Update package.json with app configuration"""
     print("📝 Updating package.json...")
     
     package_path = Path("package.json")
-    with open(package_path, 'r') as f:
-        package_data = json.load(f)
+    package_data = orjson.loads(package_path.read_bytes())
     
     # Update basic info
     package_data["name"] = config["app"]["name"].lower().replace(" ", "-")
@@ -35,18 +70,15 @@ def update_package_json(config):
     package_data["license"] = config["app"]["license"]
     package_data["author"] = config["app"]["author"]
     
-    with open(package_path, 'w') as f:
-        json.dump(package_data, f, indent=2)
-    
-    print("✅ package.json updated")
+    changed = write_if_changed(package_path, orjson.dumps(package_data, option=orjson.OPT_INDENT_2))
+    report(changed, "package.json")
 
 def update_tauri_config(config):
     """Update src-tauri/tauri.conf.json"""
     print("📝 Updating Tauri configuration...")
     
     tauri_config_path = Path("src-tauri/tauri.conf.json")
-    with open(tauri_config_path, 'r') as f:
-        tauri_config = json.load(f)
+    tauri_config = orjson.loads(tauri_config_path.read_bytes())
     
     # Update basic app info
     tauri_config["productName"] = config["app"]["productName"]
@@ -99,104 +131,39 @@ def update_tauri_config(config):
             "icons/icon.ico"
         ]
     
-    with open(tauri_config_path, 'w') as f:
-        json.dump(tauri_config, f, indent=2)
-    
-    print("✅ Tauri configuration updated")
+    changed = write_if_changed(tauri_config_path, orjson.dumps(tauri_config, option=orjson.OPT_INDENT_2))
+    report(changed, "Tauri configuration")
 
 def update_cargo_toml(config):
     """Update src-tauri/Cargo.toml"""
     print("📝 Updating Cargo.toml...")
     
     cargo_toml_path = Path("src-tauri/Cargo.toml")
-    with open(cargo_toml_path, 'r') as f:
-        content = f.read()
-    
-    # Update package section
-    lines = content.split('\n')
-    new_lines = []
-    in_package_section = False
-    
-    for line in lines:
-        if line.strip() == '[package]':
-            in_package_section = True
-            new_lines.append(line)
-        elif line.startswith('[') and line.strip() != '[package]':
-            in_package_section = False
-            new_lines.append(line)
-        elif in_package_section:
-            if line.startswith('name ='):
-                new_lines.append(f'name = "{config["app"]["name"].lower().replace(" ", "-")}"')
-            elif line.startswith('version ='):
-                new_lines.append(f'version = "{config["app"]["version"]}"')
-            elif line.startswith('description ='):
-                new_lines.append(f'description = "{config["app"]["description"]}"')
-            elif line.startswith('authors ='):
-                new_lines.append(f'authors = ["{config["app"]["author"]}"]')
-            else:
-                new_lines.append(line)
-        else:
-            new_lines.append(line)
-    
-    with open(cargo_toml_path, 'w') as f:
-        f.write('\n'.join(new_lines))
-    
-    print("✅ Cargo.toml updated")
-
-def update_python_config(config):
-    """Update Python FastAPI configuration"""
-    print("📝 Updating Python configuration...")
-    
-    main_py_path = Path("src-python/main.py")
-    with open(main_py_path, 'r') as f:
-        content = f.read()
-    
-    # Replace app title and version
-    content = content.replace(
-        'app = FastAPI(title="Tauri SvelteKit Python Sidecar", version="1.0.0")',
-        f'app = FastAPI(title="{config["python"]["title"]}", version="{config["python"]["version"]}")'
-    )
-    
-    # Replace port configuration
-    content = content.replace(
-        'PORT_API = 8008',
-        f'PORT_API = {config["python"]["port"]}'
-    )
-    
-    # Replace host configuration if it exists
-    if 'HOST_API = ' in content:
-        content = content.replace(
-            'HOST_API = "127.0.0.1"',
-            f'HOST_API = "{config["python"]["host"]}"'
-        )
-    
-    # Replace return message
-    content = content.replace(
-        'return {"message": "Tauri SvelteKit Python Sidecar", "status": "running"}',
-        f'return {{"message": "{config["python"]["title"]}", "status": "running"}}'
-    )
-    
-    with open(main_py_path, 'w') as f:
-        f.write(content)
-    
-    print("✅ Python configuration updated")
+    cargo_toml = tomlkit.parse(cargo_toml_path.read_text())
+    
+    # Update package section, keeping comments and formatting intact
+    package = cargo_toml["package"]
+    package["name"] = config["app"]["name"].lower().replace(" ", "-")
+    package["version"] = config["app"]["version"]
+    package["description"] = config["app"]["description"]
+    package["authors"] = [config["app"]["author"]]
+    
+    changed = write_if_changed(cargo_toml_path, tomlkit.dumps(cargo_toml).encode())
+    report(changed, "Cargo.toml")
 
 def update_package_scripts(config):
     """Update package.json scripts with correct icon path"""
     print("📝 Updating build scripts...")
     
     package_path = Path("package.json")
-    with open(package_path, 'r') as f:
-        package_data = json.load(f)
+    package_data = orjson.loads(package_path.read_bytes())
     
     # Update icon build script with correct path
     icon_path = config["icon"]["source"]
     package_data["scripts"]["build:icons"] = f"pnpm tauri icon {icon_path}"
     
-    with open(package_path, 'w') as f:
-        json.dump(package_data, f, indent=2)
-    
-    print("✅ Build scripts updated")
+    changed = write_if_changed(package_path, orjson.dumps(package_data, option=orjson.OPT_INDENT_2))
+    report(changed, "Build scripts")
 
 def main():
     """Main configuration function"""
@@ -208,12 +175,19 @@ def main():
     print(f"📋 Loaded configuration for: {config['app']['productName']}")
     print("")
     
+    # Skip everything when app.config.json hasn't changed since the last run
+    digest = config_hash(config)
+    if "--force" not in sys.argv[1:] and is_up_to_date(digest):
+        print("⏭️  Configuration unchanged since last run, nothing to do")
+        print("   Use --force to re-apply it anyway")
+        return
+    
     # Update all configuration files
     update_package_json(config)
     update_tauri_config(config)
     update_cargo_toml(config)
-    update_python_config(config)
     update_package_scripts(config)
+    STAMP_PATH.write_text(digest + "\n")
     
     print("")
     print("🎉 Configuration completed successfully!")
@@ -2,17 +2,34 @@
 Simple API endpoints
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import asyncio
-import json
+import orjson
 import time
 
 router = APIRouter()
 
+MAX_FIBONACCI_INPUT = 10_000
+
+# The streamed items never change, so encode them once
+STREAM_ITEMS = [
+    orjson.dumps({"count": i, "message": f"Streaming item {i}"}) + b"\n"
+    for i in range(1, 11)
+]
+
 class FibonacciRequest(BaseModel):
-    number: int
+    number: int = Field(ge=0, le=MAX_FIBONACCI_INPUT)
+
+def fib(n):
+    """Fast-doubling fibonacci, O(log n) big-int multiplications"""
+    a, b = 0, 1  # fib(k), fib(k + 1)
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a
 
 @router.get("/connect")
 async def connect():
@@ -26,13 +43,9 @@ async def connect():
 @router.post("/fibonacci")
 async def calculate_fibonacci(request: FibonacciRequest):
     """Calculate fibonacci number"""
-    def fib(n):
-        if n <= 1:
-            return n
-        return fib(n - 1) + fib(n - 2)
-    
     start_time = time.time()
-    result = fib(request.number)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(None, fib, request.number)
     end_time = time.time()
     
     return {
@@ -43,12 +56,16 @@ async def calculate_fibonacci(request: FibonacciRequest):
     }
 
 @router.get("/stream")
-async def stream_data():
-    """Stream numbers 1-10 with delay"""
+async def stream_data(delay: float = Query(0.5, ge=0, le=5)):
+    """Stream numbers 1-10, paced by delay seconds (0 disables pacing)"""
     async def generate():
-        for i in range(1, 11):
-            data = json.dumps({"count": i, "message": f"Streaming item {i}"}) + "\n"
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        for data in STREAM_ITEMS:
             yield data
-            await asyncio.sleep(0.5)
+            if delay:
+                # Pace against a fixed schedule so send time doesn't accumulate drift
+                next_tick += delay
+                await asyncio.sleep(max(0, next_tick - loop.time()))
     
-    return StreamingResponse(generate(), media_type="text/plain") 
\ No newline at end of file
+    return StreamingResponse(generate(), media_type="application/x-ndjson") 
\ No newline at end of file
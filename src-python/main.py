@@ -4,37 +4,58 @@ Supports both sidecar mode (with stdin handling) and standalone mode (with auto-
 """
 
 import os
-import signal
 import sys
 import asyncio
+import json
 import threading
 import socket
-import subprocess
-import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from uvicorn import Config, Server
 
 from api.endpoints import router as api_router
 
-PORT_API = 8009
+DEFAULT_SETTINGS = {
+    "port": 8009,
+    "host": "127.0.0.1",
+    "title": "Test App API",
+    "version": "1.0.0"
+}
+
+def load_settings():
+    """Load the "python" section of app.config.json, falling back to defaults"""
+    if getattr(sys, "frozen", False):
+        # PyInstaller bundles app.config.json next to the extracted sources
+        config_path = os.path.join(sys._MEIPASS, "app.config.json")
+    else:
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app.config.json")
+    try:
+        with open(config_path, 'r') as f:
+            python_config = json.load(f).get("python", {})
+    except (OSError, ValueError):
+        python_config = {}
+    return {**DEFAULT_SETTINGS, **python_config}
+
+SETTINGS = load_settings()
+PORT_API = SETTINGS["port"]
+HOST_API = SETTINGS["host"]
 server_instance = None
 
 # Detect running mode
+STANDALONE_ARGS = frozenset({"--standalone", "--reload"})
+STANDALONE_ENV_VARS = ("STANDALONE_MODE", "UVICORN_RELOAD")
+
 def is_standalone_mode():
     """Detect if running in standalone mode vs sidecar mode"""
     return (
-        "--standalone" in sys.argv or 
-        "--reload" in sys.argv or
-        os.getenv("STANDALONE_MODE", "").lower() == "true" or
-        os.getenv("UVICORN_RELOAD", "").lower() == "true"
+        not STANDALONE_ARGS.isdisjoint(sys.argv) or
+        any(os.getenv(name, "").lower() == "true" for name in STANDALONE_ENV_VARS)
     )
 
 STANDALONE_MODE = is_standalone_mode()
 mode_label = "standalone" if STANDALONE_MODE else "sidecar"
 
 # Create FastAPI app
-app = FastAPI(title="Test App API", version="1.0.0")
+app = FastAPI(title=SETTINGS["title"], version=SETTINGS["version"])
 
 # Add CORS
 cors_origins = [
@@ -56,104 +77,150 @@ app.add_middleware(
 # Include API routes
 app.include_router(api_router, prefix="/v1")
 
+# Static payloads, serialized once at startup
+ROOT_RESPONSE = json.dumps({
+    "message": SETTINGS["title"], 
+    "status": "running",
+    "mode": mode_label,
+    "port": PORT_API
+}).encode()
+HEALTH_RESPONSE = json.dumps({"status": "healthy", "mode": mode_label}).encode()
+
 @app.get("/")
 async def root():
-    return {
-        "message": "Test App API", 
-        "status": "running",
-        "mode": mode_label,
-        "port": PORT_API
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "mode": mode_label}
-
-def is_port_available(port):
-    """Check if a port is available"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        try:
-            s.bind(('127.0.0.1', port))
-            return True
-        except OSError:
-            return False
+    return Response(content=HEALTH_RESPONSE, media_type="application/json")
 
 def find_available_port():
-    """Find an available port starting from PORT_API"""
-    port = PORT_API
-    while port < PORT_API + 10:  # Try 10 ports
-        if is_port_available(port):
+    """Find an available port starting from PORT_API, else let the OS pick one"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # Match uvicorn's listener so ports in TIME_WAIT count as free. Only on
+        # Linux: on Windows, macOS and BSD it also lets the probe bind a port
+        # another process is listening on (e.g. via 0.0.0.0)
+        if sys.platform.startswith("linux"):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        for port in range(PORT_API, PORT_API + 10):  # Try 10 ports
+            try:
+                s.bind((HOST_API, port))
+            except OSError:
+                continue
             print(f"[{mode_label}] Using available port {port}", flush=True)
             return port
-        port += 1
-    
-    # If no port is available, use the default
-    print(f"[{mode_label}] No available ports found, using default {PORT_API}", flush=True)
-    return PORT_API
+        
+        # None of the preferred ports are free, ask the OS for any free port
+        s.bind((HOST_API, 0))
+        port = s.getsockname()[1]
+        print(f"[{mode_label}] No preferred ports available, using free port {port}", flush=True)
+        return port
 
 def start_api_server(**kwargs):
     """Start the FastAPI server"""
+    from uvicorn import Config, Server
+    
     global server_instance
     port = kwargs.get("port", find_available_port())
     
     try:
         if server_instance is None:
             print(f"[{mode_label}] Starting API server on port {port}...", flush=True)
-            print(f"[{mode_label}] Server will be available at http://127.0.0.1:{port}", flush=True)
+            print(f"[{mode_label}] Server will be available at http://{HOST_API}:{port}", flush=True)
             
-            config = Config(app, host="127.0.0.1", port=port, log_level="info")
+            config = Config(app, host=HOST_API, port=port, log_level="info")
             server_instance = Server(config)
-            asyncio.run(server_instance.serve())
+            # Run on the loop uvicorn would pick itself (uvloop when installed)
+            loop_factory = config.get_loop_factory() or asyncio.new_event_loop
+            loop = loop_factory()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(serve(server_instance))
+            finally:
+                loop.close()
         else:
             print(f"[{mode_label}] Server instance already running.", flush=True)
     except Exception as e:
         print(f"[{mode_label}] Error starting API server on port {port}: {e}", flush=True)
 
+async def serve(server):
+    """Serve the API, watching stdin for commands in sidecar mode"""
+    if not STANDALONE_MODE:
+        watch_stdin()
+    await server.serve()
+
+def handle_command(command):
+    """React to a single stdin command"""
+    if command == "sidecar shutdown":
+        print(f"[{mode_label}] Received 'sidecar shutdown' command.", flush=True)
+        if server_instance is not None:
+            server_instance.should_exit = True
+    else:
+        print(f"[{mode_label}] Invalid command [{command}]. Try again.", flush=True)
+
+def read_stdin(loop, fd, buffer):
+    """Event loop callback: consume available stdin bytes and dispatch complete lines"""
+    try:
+        data = os.read(fd, 4096)
+    except BlockingIOError:
+        return
+    if not data:
+        loop.remove_reader(fd)
+        print(f"[{mode_label}] stdin closed, no longer waiting for commands.", flush=True)
+        return
+    buffer.extend(data)
+    while b"\n" in buffer:
+        line, _, rest = buffer.partition(b"\n")
+        buffer[:] = rest
+        handle_command(line.decode(errors="replace").strip())
+
 def stdin_loop():
-    """Handle stdin commands in sidecar mode"""
+    """Blocking stdin reader, used where the event loop can't watch stdin"""
+    for line in sys.stdin:
+        handle_command(line.strip())
+
+def watch_stdin():
+    """Register stdin with the running event loop (only in sidecar mode)"""
     print(f"[{mode_label}] Waiting for commands...", flush=True)
-    while True:
-        try:
-            user_input = sys.stdin.readline().strip()
-            if user_input == "sidecar shutdown":
-                print(f"[{mode_label}] Received 'sidecar shutdown' command.", flush=True)
-                os.kill(os.getpid(), signal.SIGINT)
-            else:
-                print(f"[{mode_label}] Invalid command [{user_input}]. Try again.", flush=True)
-        except EOFError:
-            break
-        except Exception as e:
-            print(f"[{mode_label}] Error in stdin loop: {e}", flush=True)
-            break
-
-def start_input_thread():
-    """Start stdin monitoring thread (only in sidecar mode)"""
-    if not STANDALONE_MODE:
-        try:
-            input_thread = threading.Thread(target=stdin_loop, daemon=True)
-            input_thread.start()
-        except Exception as e:
-            print(f"[{mode_label}] Failed to start input handler: {e}", flush=True)
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    try:
+        loop.add_reader(fd, read_stdin, loop, fd, bytearray())
+    except (NotImplementedError, OSError):
+        # Windows event loops and non-pollable stdin (e.g. /dev/null) need a thread
+        threading.Thread(target=stdin_loop, daemon=True).start()
 
 def run_standalone():
-    """Run in standalone mode with uvicorn auto-reload"""
+    """Run in standalone mode with uvicorn auto-reload (or multiple workers with --no-reload)"""
+    import uvicorn
+    
     port = find_available_port()
+    reload = "--no-reload" not in sys.argv
     
     print(f"🚀 Starting standalone development mode")
-    print(f"🔗 API server starting at http://127.0.0.1:{port}")
-    print(f"📖 API docs will be at http://127.0.0.1:{port}/docs")
-    print(f"🔄 Auto-reload enabled")
+    print(f"🔗 API server starting at http://{HOST_API}:{port}")
+    print(f"📖 API docs will be at http://{HOST_API}:{port}/docs")
+    if reload:
+        print(f"🔄 Auto-reload enabled")
+        server_options = {
+            "reload": True,
+            "reload_dirs": ["./"],
+            "reload_excludes": ["*.pyc", "__pycache__", "*.log"],
+        }
+    else:
+        # Reload and workers are mutually exclusive in uvicorn
+        workers = min(4, os.cpu_count() or 1)
+        print(f"⚙️  Running {workers} workers")
+        server_options = {"workers": workers}
     print(f"💡 Press Ctrl+C to stop\n")
     
     try:
         uvicorn.run(
             "main:app", 
-            host="127.0.0.1", 
+            host=HOST_API, 
             port=port, 
-            reload=True,
-            reload_dirs=["./"],
-            reload_excludes=["*.pyc", "__pycache__", "*.log"],
-            log_level="info"
+            log_level="info",
+            **server_options
         )
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
@@ -163,8 +230,7 @@ def run_standalone():
         sys.exit(1)
 
 def run_sidecar():
-    """Run in sidecar mode with stdin handling"""
-    start_input_thread()
+    """Run in sidecar mode with stdin handling (single worker, stdin is per-process)"""
     start_api_server()
 
 if __name__ == "__main__":